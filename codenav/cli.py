@@ -1,14 +1,15 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "aiofiles",
 #     "jedi",
 #     "mcp",
+#     "uvloop>=0.18; sys_platform != 'win32'",
 # ]
 # ///
 
 import asyncio
 import os
+import threading
 
 from .tools import (
     find_definition,
@@ -20,13 +21,39 @@ from .tools import (
 )
 
 
-def main():
+async def ainput(prompt: str = "") -> str:
+    """Read a line of input without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def set_future(setter, value):
+        if not future.done():
+            setter(value)
+
+    def read():
+        try:
+            outcome = (future.set_result, input(prompt))
+        except BaseException as e:
+            outcome = (future.set_exception, e)
+
+        try:
+            loop.call_soon_threadsafe(set_future, *outcome)
+        except RuntimeError:
+            # The event loop already closed, e.g. after Ctrl+C
+            pass
+
+    # Unlike asyncio.to_thread, a daemon thread does not keep the process waiting for input on exit
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
+async def amain():
     # Set up project first
     print("Set up CodeNav")
     project_path = os.getcwd()
-    python_exec = input("Python executable (optional, press Enter to skip): ").strip()
+    python_exec = (await ainput("Python executable (optional, press Enter to skip): ")).strip()
 
-    result = asyncio.run(setup_codenav(project_path, python_exec if python_exec else None))
+    result = await setup_codenav(project_path, python_exec if python_exec else None)
 
     while True:
         print("\nAvailable commands:")
@@ -37,13 +64,13 @@ def main():
         print("5. Find symbol by name in file")
         print("6. Exit")
 
-        choice = input("\nEnter your choice (1-6): ").strip()
+        choice = (await ainput("\nEnter your choice (1-6): ")).strip()
 
         if choice == "1":
-            file_path = input("File path: ").strip()
+            file_path = (await ainput("File path: ")).strip()
 
             try:
-                result = asyncio.run(list_symbols(file_path))
+                result = await list_symbols(file_path)
             except Exception as e:
                 print(f"Error: {e}")
                 continue
@@ -60,12 +87,12 @@ def main():
                         print(f"  {symbol}")
 
         elif choice == "2":
-            file_path = input("File path: ").strip()
-            line = input("Line number: ").strip()
-            column = input("Column number: ").strip()
+            file_path = (await ainput("File path: ")).strip()
+            line = (await ainput("Line number: ")).strip()
+            column = (await ainput("Column number: ")).strip()
 
             try:
-                result = asyncio.run(find_definition(file_path, int(line), int(column)))
+                result = await find_definition(file_path, int(line), int(column))
             except Exception as e:
                 print(f"Error: {e}")
                 continue
@@ -76,24 +103,24 @@ def main():
 
             print("\nSymbol Information:")
             for info in result['symbol_info']:
-                print(f"  Kind: {info['kind']}")
-                print(f"  Name: {info['name']}")
-                if info['full_name']:
-                    print(f"  Full name: {info['full_name']}")
-                if info['description']:
-                    print(f"  Description: {info['description']}")
-                if info['help_text']:
-                    print(f"  Documentation: {info['help_text'][:200]}...")
+                print(f"  Kind: {info.kind}")
+                print(f"  Name: {info.name}")
+                if info.full_name:
+                    print(f"  Full name: {info.full_name}")
+                if info.description:
+                    print(f"  Description: {info.description}")
+                if info.help_text:
+                    print(f"  Documentation: {info.help_text[:200]}...")
 
         elif choice == "3":
-            file_path = input("File path: ").strip()
-            line = input("Line number: ").strip()
-            symbol_name = input("Symbol name: ").strip()
-            occurrence = input("Occurrence (default 0): ").strip()
+            file_path = (await ainput("File path: ")).strip()
+            line = (await ainput("Line number: ")).strip()
+            symbol_name = (await ainput("Symbol name: ")).strip()
+            occurrence = (await ainput("Occurrence (default 0): ")).strip()
 
             try:
                 occurrence_int = int(occurrence) if occurrence else 0
-                result = asyncio.run(find_definition_by_name(file_path, int(line), symbol_name, occurrence_int))
+                result = await find_definition_by_name(file_path, int(line), symbol_name, occurrence_int)
             except Exception as e:
                 print(f"Error: {e}")
                 continue
@@ -104,22 +131,22 @@ def main():
 
             print("\nSymbol Information:")
             for info in result['symbol_info']:
-                print(f"  Kind: {info['kind']}")
-                print(f"  Name: {info['name']}")
-                if info['full_name']:
-                    print(f"  Full name: {info['full_name']}")
-                if info['description']:
-                    print(f"  Description: {info['description']}")
-                if info['help_text']:
-                    print(f"  Documentation: {info['help_text'][:200]}...")
+                print(f"  Kind: {info.kind}")
+                print(f"  Name: {info.name}")
+                if info.full_name:
+                    print(f"  Full name: {info.full_name}")
+                if info.description:
+                    print(f"  Description: {info.description}")
+                if info.help_text:
+                    print(f"  Documentation: {info.help_text[:200]}...")
 
         elif choice == "4":
-            file_path = input("File path: ").strip()
-            line = input("Line number: ").strip()
-            column = input("Column number: ").strip()
+            file_path = (await ainput("File path: ")).strip()
+            line = (await ainput("Line number: ")).strip()
+            column = (await ainput("Column number: ")).strip()
 
             try:
-                result = asyncio.run(find_references(file_path, int(line), int(column)))
+                result = await find_references(file_path, int(line), int(column))
             except Exception as e:
                 print(f"Error: {e}")
                 continue
@@ -129,16 +156,19 @@ def main():
                 continue
 
             print("\nSymbol references:")
-            for i, ref in enumerate(result, 1):
-                print(f"\n{i}. {ref['file_path']}:{ref['line']}:{ref['column']}")
-                print(f"   {ref['source_line'].strip()}")
+            for i, ref in enumerate(result['references'], 1):
+                print(f"\n{i}. {ref.file_path}:{ref.line}:{ref.column}")
+                print(f"   {ref.source_line.strip()}")
+
+            if len(result['references']) < result['total']:
+                print(f"\nShowing {len(result['references'])} of {result['total']} references")
 
         elif choice == "5":
-            file_path = input("File path: ").strip()
-            symbol_name = input("Symbol name: ").strip()
+            file_path = (await ainput("File path: ")).strip()
+            symbol_name = (await ainput("Symbol name: ")).strip()
 
             try:
-                result = asyncio.run(find_in_file(file_path, symbol_name))
+                result = await find_in_file(file_path, symbol_name)
             except Exception as e:
                 print(f"Error: {e}")
                 continue
@@ -149,8 +179,8 @@ def main():
 
             print("\nSymbol occurrences:")
             for i, occurrence in enumerate(result, 1):
-                print(f"\n{i}. Line {occurrence['line']}:{occurrence['column']} ({occurrence['kind']})")
-                print(f"   {occurrence['source_line'].strip()}")
+                print(f"\n{i}. Line {occurrence.line}:{occurrence.column} ({occurrence.kind})")
+                print(f"   {occurrence.source_line.strip()}")
 
         elif choice == "6":
             break
@@ -159,6 +189,16 @@ def main():
             print("Invalid choice.")
 
 
+def main():
+    # Use uvloop where available (it does not support Windows)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(amain())
+    else:
+        uvloop.run(amain())
+
+
 if __name__ == "__main__":
     try:
         main()
@@ -1,15 +1,15 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "aiofiles",
 #     "jedi",
 #     "mcp",
+#     "uvloop>=0.18; sys_platform != 'win32'",
 # ]
 # ///
 
 """CodeNav - An MCP server for Python code navigation and analysis"""
 
-from typing import Optional
+from typing import Literal, Optional
 
 from mcp.server.fastmcp import FastMCP
 
@@ -78,7 +78,7 @@ async def find_definition(file_path: str, line: int, column: int):
 
 
 @mcp.tool()
-async def list_symbols(file_path: str):
+async def list_symbols(file_path: str, include_references: bool = False):
     """List symbols in a file.
 
     Lists every named code element, organized by functions, classes, variables, imports, and other symbols.
@@ -86,12 +86,19 @@ async def list_symbols(file_path: str):
 
     Args:
         file_path: Path to the Python file
+        include_references: Also list names that are only used, not defined, in the file (default: False)
     """
-    return await list_symbols_impl(file_path)
+    return await list_symbols_impl(file_path, include_references)
 
 
 @mcp.tool()
-async def find_references(file_path: str, line: int, column: int):
+async def find_references(
+    file_path: str,
+    line: int,
+    column: int,
+    scope: Literal['project', 'file'] = 'project',
+    limit: Optional[int] = 1000,
+):
     """Find all references to a symbol across the entire project and external libraries.
 
     Locates all usages across the codebase and installed packages, including third-party libraries.
@@ -101,8 +108,12 @@ async def find_references(file_path: str, line: int, column: int):
         file_path: Path to the Python file
         line: Exact line number (use exactly as provided by other CodeNav tools)
         column: Exact column number (use exactly as provided by other CodeNav tools)
+        scope: 'project' to search the entire project (default), or 'file' to only search the given file
+        limit: Maximum number of references to return, at least 1 (default: 1000), or null for no limit
+
+    Returns the references found and their total count, which is larger than the number of references when limit cut them off.
     """
-    return await find_references_impl(file_path, line, column)
+    return await find_references_impl(file_path, line, column, scope, limit)
 
 
 @mcp.tool()
@@ -119,7 +130,13 @@ async def find_in_file(file_path: str, symbol_name: str):
 
 
 def main():
-    mcp.run()
+    # Use uvloop where available (it does not support Windows)
+    try:
+        import uvloop
+    except ImportError:
+        mcp.run()
+    else:
+        uvloop.run(mcp.run_stdio_async())
 
 
 if __name__ == '__main__':
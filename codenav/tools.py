@@ -1,43 +1,291 @@
+import asyncio
+import functools
+import hashlib
+import heapq
+import itertools
+import os
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
-import aiofiles
 import jedi
+import parso
 from jedi.api.classes import Name
 
 # Global variables to store current project environment
 _current_project_path: Optional[str] = None
 _current_python_executable_path: Optional[str] = None
 _current_project: Optional[jedi.Project] = None
+_current_cache: Optional[sqlite3.Connection] = None
+
+# Jedi is not thread-safe, so all Jedi work is serialized on one dedicated worker thread
+_jedi_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="codenav-jedi")
+
+# Background task that indexes every Python file in the current project
+_index_task: Optional[asyncio.Task] = None
+
+# Directories that never contain project sources worth indexing
+_INDEX_SKIP_DIRS = {"__pycache__", "node_modules", "site-packages"}
+
+# Bump whenever the schema changes, so indexes written by older versions are rebuilt
+_CACHE_VERSION = 2
+_CACHE_SCHEMA = f"""
+DROP TABLE IF EXISTS names;
+DROP TABLE IF EXISTS files;
+DROP TABLE IF EXISTS symbols;
+CREATE TABLE files (path TEXT PRIMARY KEY, hash BLOB);
+CREATE TABLE symbols (path TEXT, name TEXT, kind TEXT, line INTEGER, column INTEGER, is_definition INTEGER);
+CREATE INDEX symbols_path_name ON symbols (path, name);
+PRAGMA user_version = {_CACHE_VERSION};
+"""
+
+
+# Records returned by the tools, which FastMCP serializes like plain dicts
+@dataclass(slots=True, frozen=True)
+class SymbolInfo:
+    kind: str
+    name: str
+    full_name: Optional[str]
+    description: str
+    help_text: str
+
+
+@dataclass(slots=True, frozen=True)
+class TypeInfo:
+    kind: str
+    name: str
+    full_name: Optional[str]
+    module_name: str
+    file_path: Optional[str]
+    line: Optional[int]
+    column: Optional[int]
+
+
+@dataclass(slots=True, frozen=True)
+class ParamInfo:
+    kind: str
+    name: str
+    description: str
+
+
+@dataclass(slots=True, frozen=True)
+class SignatureInfo:
+    name: str
+    params: list[ParamInfo]
+
+
+@dataclass(slots=True, frozen=True)
+class ImportLocation:
+    file_path: Optional[str]
+    line: int
+    column: int
+
+
+@dataclass(slots=True, frozen=True)
+class ReferenceInfo:
+    file_path: Optional[str]
+    line: int
+    column: int
+    source_line: str
+
+
+@dataclass(slots=True, frozen=True)
+class UsageInfo:
+    kind: str
+    line: int
+    column: int
+    source_line: str
+
+
+def _open_cache(project_path: str) -> sqlite3.Connection:
+    """Open the project's on-disk symbol index, falling back to memory if the project is read-only."""
+    cache_dir = Path(project_path) / ".codenav"
+
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        gitignore = cache_dir / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n")
+
+        cache = sqlite3.connect(cache_dir / "cache.sqlite")
+        cache.execute("PRAGMA journal_mode=WAL")
+        cache.execute("PRAGMA synchronous=NORMAL")
+        if cache.execute("PRAGMA user_version").fetchone()[0] != _CACHE_VERSION:
+            cache.executescript(_CACHE_SCHEMA)
+    except (OSError, sqlite3.Error):
+        cache = sqlite3.connect(":memory:")
+        cache.executescript(_CACHE_SCHEMA)
+
+    return cache
+
+
+async def _run_jedi(func, *args, **kwargs):
+    """Run a blocking Jedi call on the Jedi worker thread so the event loop stays responsive."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_jedi_executor, functools.partial(func, *args, **kwargs))
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve(file_path: str, project_path: str) -> Path:
+    """Resolve a file path against a project path, caching the result to avoid repeated realpath syscalls."""
+    # Handle relative paths by resolving against the project path
+    if not Path(file_path).is_absolute():
+        file_path_abs = Path(project_path) / file_path
+        file_path_abs = file_path_abs.resolve()
+    else:
+        file_path_abs = Path(file_path).resolve()
+
+    return file_path_abs
 
 
-async def _create_script(file_path: str) -> jedi.Script:
-    """Create Jedi script with project context for the given file."""
+def _resolve_file(file_path: str) -> Path:
+    """Resolve the given file against the current project path."""
     # Raise error if no project is set
     if _current_project is None:
         raise RuntimeError("No project set. Use set_analysis_project() first.")
 
-    # Handle relative paths by resolving against current project path
-    if not Path(file_path).is_absolute():
-        file_path_abs = Path(_current_project_path) / file_path
-        file_path_abs = file_path_abs.resolve()
-    else:
-        file_path_abs = Path(file_path).resolve()
+    return _resolve(file_path, _current_project_path)
+
 
-    # Read the file content asynchronously
-    async with aiofiles.open(file_path_abs, 'r', encoding='utf-8') as f:
-        source = await f.read()
+async def _read_file(file_path_abs: Path) -> str:
+    """Read the content of a file asynchronously."""
+    return await asyncio.to_thread(file_path_abs.read_text, encoding='utf-8')
 
-    return jedi.Script(
+
+async def _create_script(file_path: str, source: Optional[str] = None) -> jedi.Script:
+    """Create Jedi script with project context for the given file, reading it unless its source is given.
+
+    Scripts are not reused across tool calls: a script also holds the inferred state of every
+    module it imported, and nothing tracks when those change. Jedi's own parser cache still
+    skips re-parsing unchanged files.
+    """
+    file_path_abs = _resolve_file(file_path)
+    if source is None:
+        source = await _read_file(file_path_abs)
+
+    return await _run_jedi(
+        jedi.Script,
         code=source,
         path=str(file_path_abs),
         project=_current_project,
     )
 
 
+def _is_from_import(name: Name) -> bool:
+    """Check whether a name is defined by a from-import, the only names whose kind Jedi infers from another module."""
+    definition = name._name.tree_name.get_definition()
+    return definition is not None and definition.type == 'import_from' and name.is_definition()
+
+
+def _extract_names(source: str, file_path_abs: str) -> list[list]:
+    """Parse a file with Jedi and list every name in it as [name, kind, line, column, is_definition].
+
+    Only syntactic data is indexed, so the kind of a from-imported name is left as None and inferred when queried.
+    """
+    script = jedi.Script(
+        code=source,
+        path=file_path_abs,
+        project=_current_project,
+    )
+
+    return [
+        [name.name, None if _is_from_import(name) else name.type, name.line, name.column, name.is_definition()]
+        for name in script.get_names(all_scopes=True, definitions=True, references=True)
+    ]
+
+
+def _infer_kinds(source: str, file_path_abs: str, positions: set[tuple[int, int]]) -> dict[tuple[int, int], str]:
+    """Infer the kinds of the from-imported names at the given positions, as Jedi reports them in Name.type."""
+    script = jedi.Script(
+        code=source,
+        path=file_path_abs,
+        project=_current_project,
+    )
+
+    # Name.type infers through the name itself, which can differ from inferring its location
+    return {
+        (name.line, name.column): name.type
+        for name in script.get_names(all_scopes=True, definitions=True)
+        if (name.line, name.column) in positions
+    }
+
+
+async def _index_file(cache: sqlite3.Connection, file_path_abs: Path, source: str):
+    """Make sure the given symbol index is up to date for a file with the given content.
+
+    Files are only parsed when their content has changed since they were last indexed.
+    """
+    source_hash = hashlib.sha256(source.encode('utf-8')).digest()
+
+    row = cache.execute(
+        "SELECT 1 FROM files WHERE path = ? AND hash = ?",
+        (str(file_path_abs), source_hash),
+    ).fetchone()
+    if row is not None:
+        return
+
+    names = await _run_jedi(_extract_names, source, str(file_path_abs))
+
+    # Replace any stale entries for this file
+    with cache:
+        cache.execute("DELETE FROM symbols WHERE path = ?", (str(file_path_abs),))
+        cache.executemany(
+            "INSERT INTO symbols (path, name, kind, line, column, is_definition) VALUES (?, ?, ?, ?, ?, ?)",
+            [(str(file_path_abs), *name) for name in names],
+        )
+        cache.execute(
+            "INSERT OR REPLACE INTO files (path, hash) VALUES (?, ?)",
+            (str(file_path_abs), source_hash),
+        )
+
+
+def _find_python_files(project_path: str) -> list[Path]:
+    """List the Python files in a project, skipping hidden directories and virtual environments."""
+    file_paths = []
+
+    for dir_path, dir_names, file_names in os.walk(project_path):
+        dir_names[:] = [
+            dir_name for dir_name in dir_names
+            if not dir_name.startswith(".")
+            and dir_name not in _INDEX_SKIP_DIRS
+            and not os.path.exists(os.path.join(dir_path, dir_name, "pyvenv.cfg"))
+        ]
+        file_paths.extend(Path(dir_path) / file_name for file_name in file_names if file_name.endswith(".py"))
+
+    return file_paths
+
+
+def _warm_up_environment():
+    """Probe the project's Python environment and load its grammar, which Jedi otherwise does on the first query."""
+    try:
+        environment = _current_project.get_environment()
+        environment.get_sys_path()
+        environment.get_grammar()
+    except Exception:
+        # An invalid environment reports its error on the first real query instead
+        pass
+
+
+async def _build_index(project_path: str, cache: sqlite3.Connection):
+    """Warm up Jedi and index every Python file in the project into the given index so later queries skip parsing."""
+    await _run_jedi(_warm_up_environment)
+
+    file_paths = await asyncio.to_thread(_find_python_files, project_path)
+
+    for file_path_abs in file_paths:
+        try:
+            await _index_file(cache, file_path_abs, await _read_file(file_path_abs))
+        except Exception:
+            # Unreadable or unparsable files are indexed lazily (and report their error) when queried
+            continue
+
+
 async def setup_codenav(project_path: str, python_executable_path: Optional[str] = None):
     """Configure the project environment for all code analysis operations."""
-    global _current_project_path, _current_python_executable_path, _current_project
+    global _current_project_path, _current_python_executable_path, _current_project, _current_cache, _index_task
 
     # Verify the path exists
     project_path = str(Path(project_path).resolve())
@@ -50,65 +298,129 @@ async def setup_codenav(project_path: str, python_executable_path: Optional[str]
         if not Path(python_executable_path).exists():
             raise FileNotFoundError(f"Python executable path does not exist: {python_executable_path}")
 
+    project_changed = project_path != _current_project_path
+
+    # Always create a fresh project, since its environment memoizes the sys path,
+    # which editable installs and .pth changes alter (the background warm-up covers the first query)
     _current_project_path = project_path
     _current_python_executable_path = python_executable_path
     _current_project = jedi.Project(project_path, environment_path=python_executable_path)
 
+    # Symlinks may have changed since the last setup
+    _resolve.cache_clear()
+
+    if _index_task is not None:
+        _index_task.cancel()
+
+    # Keep the open index for an unchanged project, since in-flight queries may still be using it.
+    # A replaced index is not closed explicitly, so queries still using it can finish first.
+    if _current_cache is None or project_changed:
+        _current_cache = _open_cache(project_path)
+
+    # Warm up Jedi and build the symbol index in the background so setup returns immediately
+    _index_task = asyncio.create_task(_build_index(project_path, _current_cache))
+
     return "Success"
 
 
 async def find_definition_by_name(file_path: str, line: int, symbol_name: str, occurrence: int = 0):
     """Get comprehensive analysis for a symbol."""
-    # Create script to get access to the file content
-    script = await _create_script(file_path)
+    # Read the file content, which the script is built from once the column is known
+    source = await _read_file(_resolve_file(file_path))
 
     # Get the line content
-    lines = script._code.splitlines()
+    lines = source.splitlines()
     if line < 1 or line > len(lines):
         raise ValueError(f"Line {line} is out of range (file has {len(lines)} lines)")
 
     line_content = lines[line - 1]  # Convert to 0-based indexing
 
-    # Find all occurrences of the symbol name in the line
-    occurrences = []
-    start = 0
-    while True:
-        pos = line_content.find(symbol_name, start)
-        if pos == -1:
-            break
-        occurrences.append(pos)
-        start = pos + 1
+    # Find the requested whole-word occurrence of the symbol name in the line
+    pattern = re.compile(rf'(?<!\w){re.escape(symbol_name)}(?!\w)')
+    match = None
+    if occurrence >= 0:
+        match = next(itertools.islice(pattern.finditer(line_content), occurrence, None), None)
 
-    # Check if symbol was found
-    if not occurrences:
-        raise ValueError(f"Symbol '{symbol_name}' not found on line {line}")
+    if match is None:
+        # Only count every occurrence when reporting an error
+        count = sum(1 for _ in pattern.finditer(line_content))
 
-    # Check if occurrence index is valid
-    if occurrence < 0 or occurrence >= len(occurrences):
-        raise ValueError(f"Occurrence {occurrence} is out of range (found {len(occurrences)} occurrences of '{symbol_name}' on line {line})")
+        # Check if symbol was found
+        if not count:
+            raise ValueError(f"Symbol '{symbol_name}' not found on line {line}")
+
+        # Check if occurrence index is valid
+        raise ValueError(f"Occurrence {occurrence} is out of range (found {count} occurrences of '{symbol_name}' on line {line})")
 
     # Get column position
-    column = occurrences[occurrence] + 1
+    column = match.start() + 1
 
-    # Delegate to the existing function
-    return await find_definition(file_path, line, column)
+    # Delegate to the existing implementation, reusing the source already read
+    script = await _create_script(file_path, source)
+    return await _run_jedi(_find_definition, script, line, column)
 
 
 async def find_definition(file_path: str, line: int, column: int):
     """Get detailed information for specific symbol by exact location."""
     script = await _create_script(file_path)
+    return await _run_jedi(_find_definition, script, line, column)
+
+
+def _get_name_fields(name: Name, seen: dict[tuple[type, Name], dict]) -> dict:
+    """Get the fields every result reports about a name, reusing them if the name was already seen."""
+    # Jedi considers a definition equal to the value inferred from it, but their full names differ
+    key = (type(name._name), name)
+    fields = seen.get(key)
+    if fields is None:
+        # These attributes are inferred lazily by Jedi on every access
+        fields = seen[key] = {
+            "kind": name.type,
+            "name": name.name,
+            "full_name": name.full_name,
+        }
+    return fields
+
 
-    # Get definitions without following imports to see the immediate import
-    immediate_defs: list[Name] = script.goto(line=line, column=column-1, follow_imports=False)
+def _get_path_str(module_path: Optional[Path], seen: dict[Optional[Path], Optional[str]]) -> Optional[str]:
+    """Convert a module path to a string, reusing the conversion if the path was already seen."""
+    if module_path not in seen:
+        seen[module_path] = str(module_path) if module_path else None
+    return seen[module_path]
 
+
+def _find_definition(script: jedi.Script, line: int, column: int):
+    """Collect symbol, type, signature, and import information at a location."""
     # Get definitions with following imports to see the source
     source_defs: list[Name] = script.goto(line=line, column=column-1, follow_imports=True)
 
-    # Get help information
-    help_info: list[Name] = script.help(line=line, column=column-1)
+    if source_defs:
+        # Script.help returns exactly the goto results whenever there are any
+        help_info: list[Name] = source_defs
 
-    # Get type information
-    type_info: list[Name] = script.infer(line=line, column=column-1)
+        # Get type information at the location, since inferring the resolved names differs
+        # for self at its definition, properties, decorated methods, and overridden attributes
+        type_info: list[Name] = script.infer(line=line, column=column-1)
+    else:
+        # Whitespace has neither a definition nor a type, so skip the help lookup
+        # (Jedi also matches a token when the location is just past its end)
+        on_whitespace = not script._code_lines[line - 1][max(column-2, 0):column].strip()
+        if on_whitespace:
+            type_info = script.infer(line=line, column=column-1)
+            if not type_info:
+                return "No results"
+
+        # Nothing to resolve, so fall back to location lookups for keywords, operators, and literals
+        help_info = script.help(line=line, column=column-1)
+
+        # Elsewhere, inferring before the help lookup changes what it returns, so infer only now
+        if not on_whitespace:
+            type_info = script.infer(line=line, column=column-1)
+
+    # Get definitions without following imports to see the immediate import,
+    # which can only differ from the source if the source is in another file
+    immediate_defs: list[Name] = []
+    if source_defs and source_defs[0].module_path != script.path:
+        immediate_defs = script.goto(line=line, column=column-1, follow_imports=False)
 
     result = {
         "symbol_info": [],
@@ -117,55 +429,57 @@ async def find_definition(file_path: str, line: int, column: int):
         "import_location": None,
     }
 
+    # The same names often appear in both help and type information
+    seen: dict[tuple[type, Name], dict] = {}
+
+    # Many types come from the same few modules
+    path_strs: dict[Optional[Path], Optional[str]] = {}
+
     # Process help information
     for help_obj in help_info:
-        doc_data = {
-            "kind": help_obj.type,
-            "name": help_obj.name,
-            "full_name": help_obj.full_name,
-            "description": help_obj.description,
-            "help_text": getattr(help_obj, 'docstring', lambda: "")()[:5000],
-        }
+        doc_data = SymbolInfo(
+            **_get_name_fields(help_obj, seen),
+            description=help_obj.description,
+            help_text=help_obj.docstring(raw=True, fast=True)[:5000],
+        )
         result["symbol_info"].append(doc_data)
 
     # Process type information
     for type_obj in type_info:
-        type_data = {
-            "kind": type_obj.type,
-            "name": type_obj.name,
-            "full_name": type_obj.full_name,
-            "module_name": type_obj.module_name,
-            "file_path": str(type_obj.module_path) if type_obj.module_path else None,
-            "line": type_obj.line,
-            "column": type_obj.column + 1,
-        }
+        type_data = TypeInfo(
+            **_get_name_fields(type_obj, seen),
+            module_name=type_obj.module_name,
+            file_path=_get_path_str(type_obj.module_path, path_strs),
+            line=type_obj.line,
+            column=type_obj.column + 1 if type_obj.column is not None else None,
+        )
         result["type_info"].append(type_data)
 
         # Try to get signature if it's callable
         signatures = type_obj.get_signatures()
         for sig in signatures:
-            sig_data = {
-                "name": sig.name,
-                "params": [
-                    {
-                        "kind": param.kind.description,
-                        "name": param.name,
-                        "description": param.description,
-                    }
+            sig_data = SignatureInfo(
+                name=sig.name,
+                params=[
+                    ParamInfo(
+                        kind=param.kind.description,
+                        name=param.name,
+                        description=param.description,
+                    )
                     for param in sig.params
                 ],
-            }
+            )
             result["signature_info"].append(sig_data)
 
     # Check if symbol appears to be defined in another file and add import info
     if (immediate_defs and source_defs and immediate_defs[0].module_path != source_defs[0].module_path):
         # Process immediate definition (the import statement)
         import_def = immediate_defs[0]
-        import_data = {
-            "file_path": str(import_def.module_path) if import_def.module_path else None,
-            "line": import_def.line,
-            "column": import_def.column + 1,
-        }
+        import_data = ImportLocation(
+            file_path=str(import_def.module_path) if import_def.module_path else None,
+            line=import_def.line,
+            column=import_def.column + 1,
+        )
 
         result["import_location"] = import_data
 
@@ -175,24 +489,27 @@ async def find_definition(file_path: str, line: int, column: int):
     return result if has_results else "No results"
 
 
-async def list_symbols(file_path: str):
-    """List symbols in a file."""
-    script = await _create_script(file_path)
-
-    # Get all names defined in this file
-    names = script.get_names(all_scopes=True, definitions=True, references=True)
-
-    result = {
-        "modules": [],
-        "classes": [],
-        "instances": [],
-        "functions": [],
-        "params": [],
-        "paths": [],
-        "keywords": [],
-        "properties": [],
-        "statements": [],
-    }
+async def list_symbols(file_path: str, include_references: bool = False):
+    """List symbols in a file, optionally including names that are only referenced there."""
+    # Get all names defined (and optionally referenced) in this file
+    file_path_abs = _resolve_file(file_path)
+    cache = _current_cache
+    source = await _read_file(file_path_abs)
+    await _index_file(cache, file_path_abs, source)
+    names = cache.execute(
+        "SELECT DISTINCT kind, name FROM symbols WHERE path = ? AND kind IS NOT NULL AND (is_definition OR ?) ORDER BY kind, name",
+        (str(file_path_abs), include_references),
+    ).fetchall()
+    imports = cache.execute(
+        "SELECT name, line, column FROM symbols WHERE path = ? AND kind IS NULL",
+        (str(file_path_abs),),
+    ).fetchall()
+
+    # Imported names take the kind of whatever they resolve to, which can change without this file changing
+    if imports:
+        kinds = await _run_jedi(_infer_kinds, source, str(file_path_abs), {(line, column) for _, line, column in imports})
+        imported = sorted({(kinds[line, column], name) for name, line, column in imports})
+        names = dict.fromkeys(heapq.merge(names, imported))
 
     type_table = {
         "module": "modules",
@@ -206,12 +523,13 @@ async def list_symbols(file_path: str):
         "statement": "statements",
     }
 
-    for name in names:
-        result[type_table[name.type]].append(name.name)
+    # Names arrive unique and sorted in a single pass, so just split them up by kind
+    buckets = {
+        kind: [name for _, name in rows]
+        for kind, rows in itertools.groupby(names, key=lambda row: row[0])
+    }
 
-    # for each result key, unique and sort it
-    for key in result:
-        result[key] = sorted(set(result[key]))
+    result = {key: buckets.get(kind, []) for kind, key in type_table.items()}
 
     # Check if any results were found
     has_results = any(result[key] for key in result)
@@ -219,40 +537,88 @@ async def list_symbols(file_path: str):
     return result if has_results else "No results"
 
 
-async def find_references(file_path: str, line: int, column: int):
-    """Find all references to a symbol across the entire project."""
+async def find_references(
+    file_path: str,
+    line: int,
+    column: int,
+    scope: Literal['project', 'file'] = 'project',
+    limit: Optional[int] = 1000,
+):
+    """Find all references to a symbol across the entire project, or only within its file."""
+    if limit is not None and limit < 1:
+        raise ValueError(f"Limit must be at least 1, or None for no limit (got {limit})")
+
     script = await _create_script(file_path)
-    references = script.get_references(line=line, column=column-1, include_builtins=True)
+    return await _run_jedi(_find_references, script, line, column, scope, limit)
+
+
+def _find_references(
+    script: jedi.Script,
+    line: int,
+    column: int,
+    scope: Literal['project', 'file'],
+    limit: Optional[int],
+):
+    """Collect the references to the symbol at a location, up to limit if given, along with their total count."""
+    # Builtin symbols also match their compiled and stub definitions, which have no usable source location
+    source_defs: list[Name] = script.goto(line=line, column=column-1, follow_imports=True)
+    include_builtins = not (source_defs and source_defs[0].in_builtin_module())
 
-    result = []
+    references = script.get_references(line=line, column=column-1, include_builtins=include_builtins, scope=scope)
 
-    for ref in references:
-        ref_info = {
-            "file_path": str(ref.module_path) if ref.module_path else None,
-            "line": ref.line,
-            "column": ref.column + 1,
-            "source_line": ref.get_line_code(),
-        }
-        result.append(ref_info)
+    result = {
+        "references": [],
+        "total": len(references),
+    }
 
-    return result if result else "No results"
+    # References are usually concentrated in a few modules
+    path_strs: dict[Optional[Path], Optional[str]] = {}
+
+    for ref in references[:limit]:
+        ref_info = ReferenceInfo(
+            file_path=_get_path_str(ref.module_path, path_strs),
+            line=ref.line,
+            column=ref.column + 1,
+            source_line=ref.get_line_code(),
+        )
+        result["references"].append(ref_info)
+
+    return result if result["references"] else "No results"
 
 
 async def find_in_file(file_path: str, symbol_name: str):
     """Search for symbol by name across entire file."""
-    script = await _create_script(file_path)
-    names = script.get_names(all_scopes=True, definitions=True, references=True)
+    file_path_abs = _resolve_file(file_path)
+    cache = _current_cache
+    source = await _read_file(file_path_abs)
+
+    # Skip parsing entirely if the symbol name does not appear anywhere in the file
+    if symbol_name not in source:
+        return "No results"
+
+    await _index_file(cache, file_path_abs, source)
+    lines = parso.split_lines(source, keepends=True)
+
+    names = cache.execute(
+        "SELECT kind, line, column FROM symbols WHERE path = ? AND name = ? ORDER BY line, column",
+        (str(file_path_abs), symbol_name),
+    ).fetchall()
+
+    # Imported names take the kind of whatever they resolve to, which can change without this file changing
+    positions = {(line, column) for kind, line, column in names if kind is None}
+    if positions:
+        kinds = await _run_jedi(_infer_kinds, source, str(file_path_abs), positions)
+        names = [(kinds.get((line, column), kind), line, column) for kind, line, column in names]
 
     result = []
 
-    for name in names:
-        if name.name == symbol_name:
-            usage_info = {
-                "kind": name.type,
-                "line": name.line,
-                "column": name.column + 1,
-                "source_line": name.get_line_code(),
-            }
-            result.append(usage_info)
+    for kind, line, column in names:
+        usage_info = UsageInfo(
+            kind=kind,
+            line=line,
+            column=column + 1,
+            source_line=lines[line - 1],
+        )
+        result.append(usage_info)
 
     return result if result else "No results"